@@ -4,12 +4,15 @@ import subprocess
 import pathlib
 import pandas as pd
 
+from output_index import OutputIndex, config_column_values
+
 
 def group_and_clip(
         config: pd.DataFrame, 
         output_grouping_columns: list[str], 
         file_naming_columns: list[str], 
         base_output_path: str,
+        prune_index: bool = False,
     ) -> None:
     """
     Group and clip all video files cited in the configuration file.
@@ -23,6 +26,7 @@ def group_and_clip(
             Columns to be used in custom file name structure 
             (default is the name of the file being clipped from)
         base_output_path: Base output path where XML file(s) will be saved
+        prune_index: Drop output index records of clips deleted/moved by hand before clipping
     """
     
     print("Beginning clipping process...")
@@ -32,7 +36,16 @@ def group_and_clip(
     output_template = "/".join([f"{{{col}}}" for col in output_grouping_columns])
     grouped_data = config.groupby(output_grouping_columns)
 
+    output_index = OutputIndex(base_output_path)
+    if prune_index:
+        for pruned_output_path in output_index.prune():
+            print(f"Removed {pruned_output_path} from output index (no longer on disk).")
+    # Loaded once so already-indexed clips are skipped without statting them on the share
+    indexed_output_paths = output_index.indexed_output_paths()
+
     unclipped_files_due_to_preexisting_file_path = []
+    unclipped_files_due_to_output_index = []
+    unindexed_file_paths = {}
     for _, group_df in grouped_data:
         first_row_in_group = group_df.iloc[0]
         output_directory = base_output_path / pathlib.Path(output_template.format(**first_row_in_group.to_dict()))
@@ -46,6 +59,9 @@ def group_and_clip(
             file_ext = pathlib.Path(row.file_path).suffix
             output_filename = f"{base_name}_{row.unique_index}{file_ext}" 
             output_path = output_directory / output_filename
+            if str(output_path) in indexed_output_paths:
+                unclipped_files_due_to_output_index.append(str(output_path))
+                continue
             if output_path.exists():
                 unclipped_files_due_to_preexisting_file_path.append(str(output_path))
                 continue
@@ -72,8 +88,27 @@ def group_and_clip(
             except subprocess.CalledProcessError as e:
                 raise subprocess.CalledProcessError(f"Failed on config row {row.index} with error: {e}")
 
-    
-    print(f"Clipping process completed for {len(config) - len(unclipped_files_due_to_preexisting_file_path)}/{len(config)} clips.")
+            try:
+                output_index.forget_output(output_path) # stale record if the file was deleted/moved by hand
+                output_index.record_output(
+                    pipeline="clip",
+                    source_path=row.file_path,
+                    start_seconds=start_time,
+                    end_seconds=end_time,
+                    output_path=output_path,
+                    size_bytes=output_path.stat().st_size,
+                    duration_seconds=end_time - start_time,
+                    column_values=config_column_values(group_df.columns, row),
+                )
+                output_index.commit()
+            except Exception as e:
+                output_index.rollback()
+                unindexed_file_paths[str(output_path)] = e
+
+    output_index.close()
+
+    unclipped_count = len(unclipped_files_due_to_preexisting_file_path) + len(unclipped_files_due_to_output_index)
+    print(f"Clipping process completed for {len(config) - unclipped_count}/{len(config)} clips.")
 
     if unclipped_files_due_to_preexisting_file_path:
         print("WARNING, UNABLE TO SAVE FILE(S):\n")
@@ -83,4 +118,15 @@ def group_and_clip(
         print("DUE TO THE FACT THAT A FILE ALREADY EXISTS AT THIS PATH.")
         print("PLEASE RESOLVE CONFLICTS AND TRY AGAIN.")
 
-            
+    if unclipped_files_due_to_output_index:
+        print("WARNING, DID NOT SAVE FILE(S):\n")
+        for indexed_file_path in unclipped_files_due_to_output_index:
+            print(indexed_file_path)
+            print("\n")
+        print("DUE TO THE FACT THAT THE OUTPUT INDEX ALREADY RECORDS A FILE AT THIS PATH.")
+        print("IF IT WAS DELETED OR MOVED, RUN AGAIN WITH --prune-index.")
+
+    if unindexed_file_paths:
+        print("WARNING, SAVED BUT UNABLE TO RECORD IN OUTPUT INDEX:\n")
+        for unindexed_file_path, explanation in unindexed_file_paths.items():
+            print(f"{unindexed_file_path} due to {explanation}")
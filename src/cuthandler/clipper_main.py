@@ -29,6 +29,10 @@ def main():
                         help = "Using column names from the configuration file, optionally specify an output directory structure in the following format '{file_path}/{highlight_type}/{player}', be sure to type the quotations, brackets, slashes, and correct cases. Default is grouping by name of the file to be clipped from.",
                         default = "{file_name}",
                         required = False)
+    parser.add_argument("--prune-index",
+                        action = "store_true",
+                        help = "Before starting, remove output index records of outputs that were deleted or moved by hand, so they can be generated again. Checks every indexed output on disk once.",
+                        required = False)
     args = parser.parse_args()
 
     # First check to validate template syntax
@@ -66,7 +70,8 @@ def main():
         config=config, 
         output_grouping_columns=output_grouping_columns,
         file_naming_columns=file_naming_columns,
-        base_output_path=args.output_path
+        base_output_path=args.output_path,
+        prune_index=args.prune_index
     )
 
 
@@ -0,0 +1,280 @@
+"""SQLite index of everything CutHandler has written to an output directory."""
+
+import pathlib
+import sqlite3
+
+import pandas as pd
+
+
+INDEX_FILE_NAME = ".cuthandler_index.sqlite"
+
+# Columns added by ValidatedConfig (or required by it) that are not user metadata
+INTERNAL_CONFIG_COLUMNS = {
+        'timestamp_start', 'timestamp_end', 'file_path',
+        'start_td', 'end_td', 'start_seconds', 'end_seconds',
+        'unique_index'
+    }
+
+# One row per config row that was saved; XML clippings from one source share an output_path
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    id INTEGER PRIMARY KEY,
+    pipeline TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    start_seconds REAL NOT NULL,
+    end_seconds REAL NOT NULL,
+    output_path TEXT NOT NULL,
+    size_bytes INTEGER,
+    duration_seconds REAL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS outputs_output_path ON outputs (output_path);
+CREATE INDEX IF NOT EXISTS outputs_source_path ON outputs (source_path);
+CREATE TABLE IF NOT EXISTS output_columns (
+    output_id INTEGER NOT NULL REFERENCES outputs (id) ON DELETE CASCADE,
+    column_name TEXT NOT NULL,
+    column_value TEXT NOT NULL,
+    PRIMARY KEY (output_id, column_name)
+);
+CREATE INDEX IF NOT EXISTS output_columns_lookup ON output_columns (column_name, column_value);
+"""
+
+
+class OutputIndex:
+    """
+    Queryable record of clips/XML files saved under one output root.
+
+    The database lives at <output root>/.cuthandler_index.sqlite. Output paths are
+    stored relative to the output root so the index stays valid if the share is
+    mounted somewhere else.
+
+    If the database can't be opened (locked, read-only, corrupt), a warning is printed
+    and the index is disabled: lookups return nothing and records are dropped, so
+    clipping can carry on without it.
+    """
+
+    def __init__(self, base_output_path: str):
+        self.base_output_path = pathlib.Path(base_output_path)
+        self.base_output_path.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.base_output_path / INDEX_FILE_NAME
+        self.connection = None
+        try:
+            self.connection = sqlite3.connect(self.index_path)
+            self.connection.row_factory = sqlite3.Row
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            self.connection.executescript(SCHEMA)
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"WARNING: unable to open output index {self.index_path} due to {e}. Outputs will not be indexed.")
+            if self.connection is not None:
+                self.connection.close()
+            self.connection = None
+
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the index database was opened successfully."""
+        return self.connection is not None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def close(self) -> None:
+        """Commit any pending records and close the database."""
+        if not self.enabled:
+            return
+        try:
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"WARNING: unable to save output index {self.index_path} due to {e}.")
+        self.connection.close()
+        self.connection = None
+
+
+    def _relative_output_path(self, output_path) -> str:
+        """Output path as stored in the index (relative to the output root, POSIX separators)."""
+        output_path = pathlib.Path(output_path)
+        try:
+            output_path = output_path.relative_to(self.base_output_path)
+        except ValueError:
+            pass
+        return output_path.as_posix()
+
+
+    def indexed_output_paths(self) -> set[str]:
+        """All recorded output paths (absolute), loaded in one query so callers can check membership without statting."""
+        if not self.enabled:
+            return set()
+        try:
+            return {
+                str(self.base_output_path / row["output_path"])
+                for row in self.connection.execute("SELECT DISTINCT output_path FROM outputs")
+            }
+        except sqlite3.Error as e:
+            print(f"WARNING: unable to read output index {self.index_path} due to {e}. Checking output paths on disk instead.")
+            return set()
+
+
+    def forget_output(self, output_path) -> None:
+        """Drop any records of output_path (e.g. the file was deleted or moved by hand)."""
+        if not self.enabled:
+            return
+        relative_output_path = self._relative_output_path(output_path)
+        self.connection.execute(
+            "DELETE FROM output_columns WHERE output_id IN (SELECT id FROM outputs WHERE output_path = ?)",
+            (relative_output_path,)
+        )
+        self.connection.execute("DELETE FROM outputs WHERE output_path = ?", (relative_output_path,))
+
+
+    def prune(self) -> list[str]:
+        """
+        Drop records of outputs that are no longer on disk (deleted or moved by hand) and commit.
+
+        Stats every recorded output once, so run it when files have been removed rather than on every run.
+
+        Returns:
+            Absolute paths of the outputs whose records were dropped.
+        """
+        pruned_output_paths = [
+            output_path for output_path in sorted(self.indexed_output_paths())
+            if not pathlib.Path(output_path).exists()
+        ]
+        try:
+            for output_path in pruned_output_paths:
+                self.forget_output(output_path)
+            self.commit()
+        except sqlite3.Error as e:
+            self.rollback()
+            print(f"WARNING: unable to prune output index {self.index_path} due to {e}.")
+            return []
+        return pruned_output_paths
+
+
+    def record_output(
+            self,
+            *,
+            pipeline: str,
+            source_path: str,
+            start_seconds: float,
+            end_seconds: float,
+            output_path,
+            size_bytes: int,
+            duration_seconds: float,
+            column_values: dict,
+        ) -> None:
+        """
+        Add one config row's record to the index. Not committed until commit() or close().
+
+        Call forget_output() first when regenerating output_path, so old records don't linger.
+
+        Args:
+            pipeline: "clip" or "xml"
+            source_path: Path of the parent file the clipping was taken from
+            start_seconds: In cut of the clipping, in seconds
+            end_seconds: Out cut of the clipping, in seconds
+            output_path: File the clipping was saved to (video clip or XML file)
+            size_bytes: Size of output_path on disk
+            duration_seconds: Duration of the clipping
+            column_values: Config column values for the clipping (e.g. template columns), matched as text
+        """
+        if not self.enabled:
+            return
+        cursor = self.connection.execute(
+            "INSERT INTO outputs "
+            "(pipeline, source_path, start_seconds, end_seconds, output_path, size_bytes, duration_seconds) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (pipeline, str(source_path), float(start_seconds), float(end_seconds),
+             self._relative_output_path(output_path), int(size_bytes), float(duration_seconds))
+        )
+        output_id = cursor.lastrowid
+        self.connection.executemany(
+            "INSERT INTO output_columns (output_id, column_name, column_value) VALUES (?, ?, ?)",
+            [(output_id, column, _index_value(value)) for column, value in column_values.items() if not pd.isna(value)]
+        )
+
+
+    def commit(self) -> None:
+        """Commit records added since the last commit."""
+        if self.enabled:
+            self.connection.commit()
+
+
+    def rollback(self) -> None:
+        """Discard records added since the last commit."""
+        if self.enabled:
+            self.connection.rollback()
+
+
+    def find_outputs(self, columns: dict = None, *, pipeline: str = None, source_path: str = None) -> list[dict]:
+        """
+        Look up recorded clippings, e.g. index.find_outputs({"player": "Emily"}, pipeline="clip").
+
+        Results come from the index alone; an output deleted or moved by hand is still
+        returned until prune() is run.
+
+        Args:
+            columns: Config column names mapped to the value to match (compared as text, 7.0 matches 7)
+            pipeline: Only return outputs of this pipeline ("clip" or "xml")
+            source_path: Only return clippings taken from this parent file
+
+        Returns:
+            A list of dicts, one per matching clipping, with the absolute output_path
+            and a "columns" dict of the recorded config column values.
+        """
+        if not self.enabled:
+            return []
+        query = "FROM outputs o"
+        conditions = []
+        params = []
+        for i, (column, value) in enumerate((columns or {}).items()):
+            query += (f" JOIN output_columns c{i} ON c{i}.output_id = o.id"
+                      f" AND c{i}.column_name = ? AND c{i}.column_value = ?")
+            params += [column, _index_value(value)]
+        if pipeline is not None:
+            conditions.append("o.pipeline = ?")
+            params.append(pipeline)
+        if source_path is not None:
+            conditions.append("o.source_path = ?")
+            params.append(str(source_path))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        # Fetch the column values of every match in one query rather than one per match
+        columns_by_output_id = {}
+        for column_row in self.connection.execute(
+                f"SELECT output_id, column_name, column_value FROM output_columns "
+                f"WHERE output_id IN (SELECT o.id {query})", params):
+            columns_by_output_id.setdefault(column_row["output_id"], {})[column_row["column_name"]] = column_row["column_value"]
+
+        results = []
+        for row in self.connection.execute(f"SELECT o.* {query} ORDER BY o.output_path, o.start_seconds", params):
+            result = dict(row)
+            result["output_path"] = str(self.base_output_path / row["output_path"])
+            result["columns"] = columns_by_output_id.get(row["id"], {})
+            results.append(result)
+        return results
+
+
+def _index_value(value) -> str:
+    """Text form of a config value as stored/matched in the index (7.0 -> "7", since blank cells make pandas read int columns as float)."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def config_column_values(columns, row: tuple) -> dict:
+    """
+    User-provided config column values of a row (drops CutHandler's internal columns).
+
+    Args:
+        columns: Column names of the config DataFrame
+        row: Row from DataFrame.itertuples() (index first, then values in column order)
+    """
+    return {column: value for column, value in zip(columns, row[1:]) if column not in INTERNAL_CONFIG_COLUMNS}
@@ -18,6 +18,10 @@ def main():
                         type = str,
                         help = "Top-level path to start saving clips to.",
                         required = True)
+    parser.add_argument("--prune-index",
+                        action = "store_true",
+                        help = "Before starting, remove output index records of outputs that were deleted or moved by hand, so they can be generated again. Checks every indexed output on disk once.",
+                        required = False)
     args = parser.parse_args()
 
     # Validate and standardize config, ensure presence of all file_paths
@@ -32,7 +36,8 @@ def main():
     # Use xmler to encode clippings; one XML file per file in config
     group_and_xml(
         config=config,
-        base_output_path=args.output_path
+        base_output_path=args.output_path,
+        prune_index=args.prune_index
     )
 
 
@@ -4,6 +4,8 @@ import json
 import pandas as pd
 import xml.etree.ElementTree as ET
 
+from output_index import OutputIndex, config_column_values
+
 
 def _get_video_properties(file_path: str) -> dict:
     """
@@ -186,7 +188,8 @@ def _add_links(
 
 def group_and_xml(
         config: pd.DataFrame,
-        base_output_path: str
+        base_output_path: str,
+        prune_index: bool = False,
     ) -> None:
     """
     Group and encode all video files cited in the configuration file to XML.
@@ -196,6 +199,7 @@ def group_and_xml(
     Args:
         config: Validated pd.DataFrame version of the config file
         base_output_path: Base output path where XML file(s) will be saved
+        prune_index: Drop output index records of XML files deleted/moved by hand before encoding
     """
 
     print("Beginning XML encoding process...")
@@ -204,13 +208,25 @@ def group_and_xml(
     base_output_path.mkdir(parents=True, exist_ok=True)
     gbo = config.groupby('file_path')
 
+    output_index = OutputIndex(base_output_path)
+    if prune_index:
+        for pruned_output_path in output_index.prune():
+            print(f"Removed {pruned_output_path} from output index (no longer on disk).")
+    # Loaded once so already-indexed XML files are skipped without statting them on the share
+    indexed_output_paths = output_index.indexed_output_paths()
+
     encoded_and_saved_file_count = 0
     unencoded_or_unsaved_video_files = {}
+    unindexed_xml_files = {}
     for file_path, df in gbo:
         
         print(f"Encoding file '{df['file_name'].iloc[0]}' from config...")
         file_name_stem = pathlib.Path(df['file_name'].iloc[0]).stem
         output_xml_path = base_output_path / f"{file_name_stem}.xml"
+        if str(output_xml_path) in indexed_output_paths:
+            print(f"XML file {output_xml_path} is already recorded in the output index, proceeding with other files.")
+            unencoded_or_unsaved_video_files[file_path] = f"XML file {output_xml_path} is already recorded in the output index. Will not overwrite (if it was deleted or moved, run again with --prune-index)."
+            continue
         if output_xml_path.exists():
             print(f"XML file {output_xml_path} already exists in output directory, proceeding with other files.")
             unencoded_or_unsaved_video_files[file_path] = f"XML file {output_xml_path} already exists in output directory. Will not overwrite."
@@ -221,6 +237,7 @@ def group_and_xml(
             is_first_clip = True
             current_timeline_frame = 0
             timebase_int = int(video_props['timebase'])
+            encoded_clips = []
 
             for clip_index, row in enumerate(df.itertuples(), start=1):
                 
@@ -270,6 +287,7 @@ def group_and_xml(
                 _add_links(a1_clip, v_clip_id, a1_clip_id, a2_clip_id, clip_index)
                 _add_links(a2_clip, v_clip_id, a1_clip_id, a2_clip_id, clip_index)
                 current_timeline_frame = timeline_end_frame
+                encoded_clips.append((row, clip_duration_frames / timebase_int))
 
             ET.SubElement(sequence, "duration").text = str(current_timeline_frame)
             # Write the XML file
@@ -286,6 +304,27 @@ def group_and_xml(
             unencoded_or_unsaved_video_files[file_path] = e
             print(f"Unable to encode file {file_path} to XML, proceeding with other files.")
             continue
+
+        try:
+            output_index.forget_output(output_xml_path) # stale records if the file was deleted/moved by hand
+            output_xml_size = output_xml_path.stat().st_size
+            for row, clip_duration_seconds in encoded_clips:
+                output_index.record_output(
+                    pipeline="xml",
+                    source_path=file_path,
+                    start_seconds=row.start_seconds,
+                    end_seconds=row.end_seconds,
+                    output_path=output_xml_path,
+                    size_bytes=output_xml_size,
+                    duration_seconds=clip_duration_seconds,
+                    column_values=config_column_values(df.columns, row),
+                )
+            output_index.commit()
+        except Exception as e:
+            output_index.rollback()
+            unindexed_xml_files[str(output_xml_path)] = e
+
+    output_index.close()
     
 
     print(f"XML encoding process complete.") 
@@ -293,4 +332,8 @@ def group_and_xml(
     if unencoded_or_unsaved_video_files:
         print("Failed to encode:")
         for bad_file, explanation in unencoded_or_unsaved_video_files.items():
-            print(f"{bad_file} due to {explanation}")
\ No newline at end of file
+            print(f"{bad_file} due to {explanation}")
+    if unindexed_xml_files:
+        print("Saved but unable to record in output index:")
+        for unindexed_file, explanation in unindexed_xml_files.items():
+            print(f"{unindexed_file} due to {explanation}")
\ No newline at end of file